@@ -18,20 +18,26 @@ from kilroy_face_twitter import log
 from kilroy_face_twitter.config import Config, get_config
 from kilroy_face_twitter.face import TwitterFace
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 cli = typer.Typer()  # this is actually callable and thus can be an entry point
 
 logger = logging.getLogger(__name__)
 
 
-async def shutdown(sig: signal.Signals, loop: asyncio.AbstractEventLoop):
-    loop.remove_signal_handler(sig)
-    logger.info(f"Received exit signal {sig.name}...")
-    tasks = [
-        task
-        for task in asyncio.all_tasks()
-        if task is not asyncio.current_task()
-    ]
-    logger.info(f"Cancelling {len(tasks)} outstanding tasks...")
+async def shutdown(
+    signals: asyncio.Queue, loop: asyncio.AbstractEventLoop
+) -> None:
+    sig = await signals.get()
+    for s in (signal.SIGINT, signal.SIGTERM):
+        loop.remove_signal_handler(s)
+    logger.info("Received exit signal %s...", sig.name)
+    tasks = asyncio.all_tasks(loop)
+    tasks.discard(asyncio.current_task())
+    logger.info("Cancelling %d outstanding tasks...", len(tasks))
     for task in tasks:
         task.cancel()
     await asyncio.gather(*tasks, return_exceptions=True)
@@ -40,10 +46,11 @@ async def shutdown(sig: signal.Signals, loop: asyncio.AbstractEventLoop):
 
 async def attach_signal_handlers() -> None:
     loop = asyncio.get_running_loop()
+    signals = asyncio.Queue()
     for sig in (signal.SIGINT, signal.SIGTERM):
-        loop.add_signal_handler(
-            sig, lambda s=sig: asyncio.create_task(shutdown(s, loop))
-        )
+        loop.add_signal_handler(sig, signals.put_nowait, sig)
+    # single task waiting for any signal, no task is created on signal
+    asyncio.create_task(shutdown(signals, loop))
 
 
 async def load_or_init(face: TwitterFace, state_dir: Path) -> None:
@@ -67,6 +74,13 @@ async def load_or_init(face: TwitterFace, state_dir: Path) -> None:
         logger.info("Initialization complete.")
 
 
+def consume_task_exception(task: asyncio.Task) -> None:
+    # retrieving the exception here prevents "never retrieved" warnings,
+    # reporting it is left to run, which either logs or re-raises it
+    if not task.cancelled():
+        task.exception()
+
+
 async def run(config: Config) -> None:
     await attach_signal_handlers()
 
@@ -82,6 +96,8 @@ async def run(config: Config) -> None:
     init_task = asyncio.create_task(load_or_init(face, state_dir))
 
     tasks = [server_task, init_task]
+    for task in tasks:
+        task.add_done_callback(consume_task_exception)
 
     try:
         done, pending = await asyncio.wait(tasks, return_when=FIRST_EXCEPTION)
@@ -93,12 +109,10 @@ async def run(config: Config) -> None:
 
     for task in pending:
         task.cancel()
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            logger.warning("Unhandled exception.", exc_info=e)
+    results = await asyncio.gather(*pending, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning("Unhandled exception.", exc_info=result)
 
     for task in done:
         task.result()
@@ -114,6 +128,9 @@ async def run(config: Config) -> None:
         logger.info("Cleaning up...")
         await face.cleanup()
 
+        logger.info("Closing...")
+        await face.close()
+
 
 @cli.command()
 def main(
@@ -139,6 +156,9 @@ def main(
         raise typer.Exit(1)
     logger.info("Config loaded!")
 
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     asyncio.run(run(config))
 
 
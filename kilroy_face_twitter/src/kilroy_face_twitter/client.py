@@ -1,5 +1,24 @@
-from tweepy import API, OAuth1UserHandler
-from tweepy.asynchronous import AsyncClient
+import asyncio
+from typing import TYPE_CHECKING, Optional
+
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    from tweepy import API, User
+    from tweepy.asynchronous import AsyncClient
+
+# maximum number of simultaneous connections to the API
+MAX_CONNECTIONS = 100
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    # tweepy closes its session after every request,
+    # which would otherwise drop all pooled connections
+    def close(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        super().close()
 
 
 class TwitterClient:
@@ -10,7 +29,13 @@ class TwitterClient:
         access_token: str,
         access_token_secret: str,
         wait_on_rate_limit: bool = True,
+        max_requests_per_second: Optional[float] = None,
     ) -> None:
+        # imported here to keep the import of this module cheap
+        from tweepy import API, OAuth1UserHandler
+
+        from kilroy_face_twitter.throttling import ThrottledAsyncClient
+
         self._v1 = API(
             OAuth1UserHandler(
                 consumer_key,
@@ -20,18 +45,48 @@ class TwitterClient:
             ),
             wait_on_rate_limit=wait_on_rate_limit,
         )
-        self._v2 = AsyncClient(
+        self._v1_adapter = KeepAliveAdapter(
+            pool_connections=1, pool_maxsize=MAX_CONNECTIONS
+        )
+        self._v1.session.mount("https://", self._v1_adapter)
+        self._v2 = ThrottledAsyncClient(
             consumer_key=consumer_key,
             consumer_secret=consumer_secret,
             access_token=access_token,
             access_token_secret=access_token_secret,
             wait_on_rate_limit=wait_on_rate_limit,
+            max_requests_per_second=max_requests_per_second,
         )
 
+        self._me: Optional["User"] = None
+        self._me_lock = asyncio.Lock()
+
     @property
-    def v1(self) -> API:
+    def v1(self) -> "API":
         return self._v1
 
     @property
-    def v2(self) -> AsyncClient:
+    def v2(self) -> "AsyncClient":
+        # without a session tweepy opens a new one for every request,
+        # a shared one keeps connections alive between requests
+        if self._v2.session is None or self._v2.session.closed:
+            import aiohttp
+
+            self._v2.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS)
+            )
         return self._v2
+
+    async def me(self) -> "User":
+        # the authenticated user doesn't change for the same credentials
+        async with self._me_lock:
+            if self._me is None:
+                response = await self.v2.get_me()
+                self._me = response.data
+        return self._me
+
+    async def close(self) -> None:
+        self._v1_adapter.shutdown()
+        if self._v2.session is not None:
+            await self._v2.session.close()
+            self._v2.session = None
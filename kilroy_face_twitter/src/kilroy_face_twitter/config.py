@@ -1,6 +1,7 @@
 from pathlib import Path
-from typing import Iterable, Optional, TextIO, Tuple
+from typing import Any, Dict, Iterable, Optional, TextIO, Tuple
 
+import yaml
 from omegaconf import OmegaConf
 from platformdirs import user_cache_dir
 from pydantic import BaseModel, Extra
@@ -9,6 +10,11 @@ from pydantic.env_settings import BaseSettings, SettingsSourceCallable
 from kilroy_face_twitter import resource_text
 from kilroy_face_twitter.face import Params
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 CACHE_DIR = Path(user_cache_dir("kilroybot"))
 
 
@@ -41,15 +47,24 @@ class Config(BaseConfig):
     state_directory: Path = CACHE_DIR / "kilroy-face-twitter" / "state"
 
 
+def load_yaml(text: str) -> Dict[str, Any]:
+    return yaml.load(text, Loader=SafeLoader) or {}
+
+
 def get_config(
     f: Optional[TextIO] = None, overrides: Optional[Iterable[str]] = None
 ) -> Config:
-    config = OmegaConf.create(resource_text("config.yaml"))
+    overlays = []
     if f is not None:
-        config = OmegaConf.merge(config, OmegaConf.load(f))
-    if overrides is not None:
-        config = OmegaConf.merge(
-            config, OmegaConf.from_dotlist(list(overrides))
-        )
+        overlays.append(load_yaml(f.read()))
+    if overrides:
+        overlays.append(OmegaConf.from_dotlist(list(overrides)))
+
+    config = load_yaml(resource_text("config.yaml"))
+    if not overlays:
+        return Config.parse_obj(config)
+
+    # freshly parsed tree can be merged into in place, without copying
+    config = OmegaConf.unsafe_merge(OmegaConf.create(config), *overlays)
     config = OmegaConf.to_container(config, resolve=True)
     return Config.parse_obj(config)
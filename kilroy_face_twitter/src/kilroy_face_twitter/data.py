@@ -1,7 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain
 from typing import Any, Dict, List, Literal, Optional, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from tweepy import (
     List as TwitterList,
     Media,
@@ -97,6 +99,22 @@ UserField = Literal[
 ]
 
 
+def _merge(a: Optional[List[T]], b: Optional[List[T]]) -> Optional[List[T]]:
+    return list(dict.fromkeys(chain(a or (), b or ()))) or None
+
+
+@lru_cache(maxsize=64)
+def _add_fields(a: "TweetFields", b: "TweetFields") -> "TweetFields":
+    return TweetFields(
+        expansions=_merge(a.expansions, b.expansions),
+        media_fields=_merge(a.media_fields, b.media_fields),
+        place_fields=_merge(a.place_fields, b.place_fields),
+        poll_fields=_merge(a.poll_fields, b.poll_fields),
+        tweet_fields=_merge(a.tweet_fields, b.tweet_fields),
+        user_fields=_merge(a.user_fields, b.user_fields),
+    )
+
+
 class TweetFields(BaseModel):
     expansions: Optional[List[Expansion]] = None
     media_fields: Optional[List[MediaField]] = None
@@ -105,29 +123,44 @@ class TweetFields(BaseModel):
     tweet_fields: Optional[List[TweetField]] = None
     user_fields: Optional[List[UserField]] = None
 
-    def __add__(self, other):
-        def merge(
-            a: Optional[List[T]], b: Optional[List[T]]
-        ) -> Optional[List[T]]:
-            return list(set((a or []) + (b or []))) or None
+    _kwargs: Optional[Dict[str, Any]] = PrivateAttr(None)
+    _hash: Optional[int] = PrivateAttr(None)
 
-        if isinstance(other, TweetFields):
-            return TweetFields(
-                expansions=merge(self.expansions, other.expansions),
-                media_fields=merge(self.media_fields, other.media_fields),
-                place_fields=merge(self.place_fields, other.place_fields),
-                poll_fields=merge(self.poll_fields, other.poll_fields),
-                tweet_fields=merge(self.tweet_fields, other.tweet_fields),
-                user_fields=merge(self.user_fields, other.user_fields),
+    class Config:
+        allow_mutation = False
+
+    def __hash__(self) -> int:
+        # fields are used as keys for every tweet lookup
+        if self._hash is None:
+            self._hash = hash(
+                tuple(
+                    tuple(value) if value is not None else None
+                    for value in self.__dict__.values()
+                )
             )
+        return self._hash
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in self.__dict__.values())
+
+    def __add__(self, other):
+        if isinstance(other, TweetFields):
+            if other.is_empty():
+                return self
+            if self.is_empty():
+                return other
+            return _add_fields(self, other)
         else:
             raise ValueError(f"Can't add TweetFields to {type(other)}")
 
     def to_kwargs(self) -> Dict[str, Any]:
-        return self.dict(exclude_none=True)
+        if self._kwargs is None:
+            self._kwargs = self.dict(exclude_none=True)
+        # the memo is shared, so callers get their own lists
+        return {name: list(values) for name, values in self._kwargs.items()}
 
 
-@dataclass
+@dataclass(slots=True)
 class TweetIncludes:
     lists: Optional[List[TwitterList]] = None
     media: Optional[List[Media]] = None
@@ -135,7 +168,35 @@ class TweetIncludes:
     polls: Optional[List[Poll]] = None
     spaces: Optional[List[Space]] = None
     users: Optional[List[User]] = None
+    _users_by_id: Optional[Dict[int, User]] = field(
+        default=None, repr=False, compare=False
+    )
+    _media_by_key: Optional[Dict[str, Media]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def get_user(self, id: int) -> User:
+        # includes are shared by all tweets from the same response,
+        # so the index is built once instead of scanning for every tweet
+        if self._users_by_id is None:
+            self._users_by_id = {user.id: user for user in self.users or []}
+        return self._users_by_id[id]
+
+    def get_media(self, key: str) -> Media:
+        if self._media_by_key is None:
+            self._media_by_key = {
+                media.media_key: media for media in self.media or []
+            }
+        return self._media_by_key[key]
 
     @staticmethod
     def from_response(response: Response) -> "TweetIncludes":
-        return TweetIncludes(**(response.includes or {}))
+        includes = response.includes or {}
+        return TweetIncludes(
+            includes.get("lists"),
+            includes.get("media"),
+            includes.get("places"),
+            includes.get("polls"),
+            includes.get("spaces"),
+            includes.get("users"),
+        )
@@ -1,17 +1,27 @@
+import asyncio
 import logging
 from abc import ABC, abstractmethod
+from contextlib import aclosing
+from copy import copy
 from dataclasses import dataclass
 from datetime import datetime
-from functools import partial
+from functools import cached_property, lru_cache, partial
 from pathlib import Path
-from typing import Any, AsyncIterable, Dict, Optional, Set, Tuple, Type
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 from uuid import UUID
 
-from aiostream import stream
+from pydantic import PositiveFloat, conint
 from tweepy import Tweet
 
 from kilroy_face_server_py_sdk import (
-    Categorizable,
     CategorizableBasedParameter,
     Face,
     JSONSchema,
@@ -24,6 +34,8 @@ from kilroy_face_server_py_sdk import (
 )
 from kilroy_face_twitter.client import TwitterClient
 from kilroy_face_twitter.data import TweetFields, TweetIncludes
+from kilroy_face_twitter.loaders import TweetLoader
+from kilroy_face_twitter.models import ToxicityModelLoader
 from kilroy_face_twitter.post import Post
 from kilroy_face_twitter.posters import Poster, BasicPoster
 from kilroy_face_twitter.processors import Processor
@@ -31,9 +43,18 @@ from kilroy_face_twitter.restrictions import Restriction
 from kilroy_face_twitter.scoring.modifiers import ScoreModifier
 from kilroy_face_twitter.scoring.raw import Scorer, RelativeLikesScorer
 from kilroy_face_twitter.scrapers import Scraper, TimelineScraper
+from kilroy_face_twitter.utils import (
+    CachedCategorizable,
+    cached_classproperty,
+    close_http_client,
+    load_state_dict,
+    save_state_dict,
+    take,
+)
 from kilroy_server_py_utils import (
     CategorizableBasedOptionalParameter,
     Configurable,
+    background,
 )
 
 logger = logging.getLogger(__name__)
@@ -44,6 +65,14 @@ class Params(SerializableModel):
     consumer_secret: str
     access_token: str
     access_token_secret: str
+    max_requests_per_second: Optional[PositiveFloat] = None
+    # how many scraped tweets can be processed at the same time
+    scrap_concurrency: int = 8
+    # how many scored tweets can be looked up with a single request
+    score_batch_size: conint(ge=1, le=100) = 100
+    # how many looked up tweets are kept and for how long (in seconds)
+    score_cache_size: int = 10000
+    score_cache_ttl: float = 60
     poster_type: str = "basic"
     posters_params: Dict[str, Dict[str, Any]] = {}
     scorer_type: str = "relativeLikes"
@@ -56,7 +85,20 @@ class Params(SerializableModel):
     restrictions_params: Dict[str, Dict[str, Any]] = {}
 
 
-@dataclass
+SCORE_FIELDS = TweetFields()
+SCRAP_FIELDS = TweetFields(tweet_fields=["id"])
+
+
+@lru_cache(maxsize=None)
+def merge_needed_fields(base: TweetFields, *types: type) -> TweetFields:
+    # needed fields depend only on the component classes
+    fields = base
+    for type_ in types:
+        fields = fields + type_.needed_fields
+    return fields
+
+
+@dataclass(slots=True)
 class State:
     processor: Processor
     poster: Poster
@@ -70,12 +112,27 @@ class State:
     restriction: Optional[Restriction]
     restrictions_params: Dict[str, Dict[str, Any]]
     client: TwitterClient
+    tweet_loader: TweetLoader
+
+    @property
+    def score_fields(self) -> TweetFields:
+        types = [type(self.scorer)]
+        if self.score_modifier is not None:
+            types.append(type(self.score_modifier))
+        return merge_needed_fields(SCORE_FIELDS, *types)
+
+    @property
+    def scrap_fields(self) -> TweetFields:
+        types = [type(self.processor), type(self.scorer)]
+        if self.score_modifier is not None:
+            types.append(type(self.score_modifier))
+        return merge_needed_fields(SCRAP_FIELDS, *types)
 
 
 class PosterParameter(CategorizableBasedParameter[State, Poster]):
     @classmethod
     async def _get_params(cls, state: State, category: str) -> Dict[str, Any]:
-        return {**state.posters_params.get(category, {})}
+        return state.posters_params.get(category, {})
 
     # noinspection PyMethodParameters
     @classproperty
@@ -86,7 +143,7 @@ class PosterParameter(CategorizableBasedParameter[State, Poster]):
 class ScorerParameter(CategorizableBasedParameter[State, Scorer]):
     @classmethod
     async def _get_params(cls, state: State, category: str) -> Dict[str, Any]:
-        return {**state.scorers_params.get(category, {})}
+        return state.scorers_params.get(category, {})
 
     # noinspection PyMethodParameters
     @classproperty
@@ -99,13 +156,13 @@ class ScoreModifierParameter(
 ):
     @classmethod
     async def _get_params(cls, state: State, category: str) -> Dict[str, Any]:
-        return {**state.score_modifiers_params.get(category, {})}
+        return state.score_modifiers_params.get(category, {})
 
 
 class ScraperParameter(CategorizableBasedParameter[State, Scraper]):
     @classmethod
     async def _get_params(cls, state: State, category: str) -> Dict[str, Any]:
-        return {**state.scrapers_params.get(category, {})}
+        return state.scrapers_params.get(category, {})
 
     # noinspection PyMethodParameters
     @classproperty
@@ -118,7 +175,7 @@ class RestrictionParameter(
 ):
     @classmethod
     async def _get_params(cls, state: State, category: str) -> Dict[str, Any]:
-        return {**state.restrictions_params.get(category, {})}
+        return state.restrictions_params.get(category, {})
 
 
 class TwitterFaceBase(Face[State], ABC):
@@ -128,6 +185,11 @@ class TwitterFaceBase(Face[State], ABC):
     def post_type(cls) -> str:
         pass
 
+    @cached_property
+    def _params(self) -> Params:
+        # kwargs never change after init, so they are parsed only once
+        return Params(**self._kwargs)
+
     @classmethod
     async def _build_processor(cls) -> Processor:
         return await cls._build_generic(Processor, category=cls.post_type)
@@ -180,30 +242,65 @@ class TwitterFaceBase(Face[State], ABC):
             **params.restrictions_params.get(params.restriction_type, {}),
         )
 
-    @staticmethod
-    async def _build_client(params: Params) -> TwitterClient:
+    @cached_property
+    def _client(self) -> TwitterClient:
+        params = self._params
         return TwitterClient(
             consumer_key=params.consumer_key,
             consumer_secret=params.consumer_secret,
             access_token=params.access_token,
             access_token_secret=params.access_token_secret,
+            max_requests_per_second=params.max_requests_per_second,
+        )
+
+    async def _build_client(self) -> TwitterClient:
+        # every state of this face shares one client and its connections
+        return self._client
+
+    @staticmethod
+    async def _build_tweet_loader(
+        client: TwitterClient, params: Params
+    ) -> TweetLoader:
+        return TweetLoader(
+            client,
+            max_batch_size=params.score_batch_size,
+            cache_size=params.score_cache_size,
+            cache_ttl=params.score_cache_ttl,
         )
 
     async def _build_default_state(self) -> State:
-        params = Params(**self._kwargs)
+        params = self._params
+        (
+            processor,
+            poster,
+            scorer,
+            score_modifier,
+            scraper,
+            restriction,
+            client,
+        ) = await asyncio.gather(
+            self._build_processor(),
+            self._build_poster(params),
+            self._build_scorer(params),
+            self._build_score_modifier(params),
+            self._build_scraper(params),
+            self._build_restriction(params),
+            self._build_client(),
+        )
         return State(
-            processor=await self._build_processor(),
-            poster=await self._build_poster(params),
+            processor=processor,
+            poster=poster,
             posters_params=params.posters_params,
-            scorer=await self._build_scorer(params),
+            scorer=scorer,
             scorers_params=params.scorers_params,
-            score_modifier=await self._build_score_modifier(params),
+            score_modifier=score_modifier,
             score_modifiers_params=params.score_modifiers_params,
-            scraper=await self._build_scraper(params),
+            scraper=scraper,
             scrapers_params=params.scrapers_params,
-            restriction=await self._build_restriction(params),
+            restriction=restriction,
             restrictions_params=params.restrictions_params,
-            client=await self._build_client(params),
+            client=client,
+            tweet_loader=await self._build_tweet_loader(client, params),
         )
 
     @staticmethod
@@ -256,14 +353,28 @@ class TwitterFaceBase(Face[State], ABC):
             "restrictions_params": state.restrictions_params,
         }
 
+    @staticmethod
+    async def _save_state_dict(
+        state_dict: Dict[str, Any], directory: Path, name: str = "state.json"
+    ) -> None:
+        await save_state_dict(state_dict, directory, name)
+
+    @staticmethod
+    async def _load_state_dict(
+        directory: Path, name: str = "state.json"
+    ) -> Dict[str, Any]:
+        return await load_state_dict(directory, name)
+
     @classmethod
     async def _save_state(cls, state: State, directory: Path) -> None:
-        await cls._save_processor(state, directory)
-        await cls._save_poster(state, directory)
-        await cls._save_scorer(state, directory)
-        await cls._save_score_modifier(state, directory)
-        await cls._save_scraper(state, directory)
-        await cls._save_restriction(state, directory)
+        await asyncio.gather(
+            cls._save_processor(state, directory),
+            cls._save_poster(state, directory),
+            cls._save_scorer(state, directory),
+            cls._save_score_modifier(state, directory),
+            cls._save_scraper(state, directory),
+            cls._save_restriction(state, directory),
+        )
         state_dict = await cls._create_state_dict(state)
         await cls._save_state_dict(state_dict, directory)
 
@@ -368,79 +479,108 @@ class TwitterFaceBase(Face[State], ABC):
 
     async def _load_saved_state(self, directory: Path) -> State:
         state_dict = await self._load_state_dict(directory)
-        params = Params(**self._kwargs)
+        params = self._params
+        (
+            processor,
+            poster,
+            scorer,
+            score_modifier,
+            scraper,
+            restriction,
+            client,
+        ) = await asyncio.gather(
+            self._load_processor(directory, state_dict),
+            self._load_poster(directory, state_dict, params),
+            self._load_scorer(directory, state_dict, params),
+            self._load_score_modifier(directory, state_dict, params),
+            self._load_scraper(directory, state_dict, params),
+            self._load_restriction(directory, state_dict, params),
+            self._build_client(),
+        )
 
         return State(
-            processor=await self._load_processor(directory, state_dict),
-            poster=await self._load_poster(directory, state_dict, params),
+            processor=processor,
+            poster=poster,
             posters_params=state_dict.get(
                 "posters_params", params.posters_params
             ),
-            scorer=await self._load_scorer(directory, state_dict, params),
+            scorer=scorer,
             scorers_params=state_dict.get(
                 "scorers_params", params.scorers_params
             ),
-            score_modifier=await self._load_score_modifier(
-                directory, state_dict, params
-            ),
+            score_modifier=score_modifier,
             score_modifiers_params=state_dict.get(
                 "score_modifiers_params", params.score_modifiers_params
             ),
-            scraper=await self._load_scraper(directory, state_dict, params),
+            scraper=scraper,
             scrapers_params=state_dict.get(
                 "scrapers_params", params.scrapers_params
             ),
-            restriction=await self._load_restriction(
-                directory, state_dict, params
-            ),
+            restriction=restriction,
             restrictions_params=state_dict.get(
                 "restrictions_params", params.restrictions_params
             ),
-            client=await self._build_client(params),
+            client=client,
+            tweet_loader=await self._build_tweet_loader(client, params),
         )
 
+    @staticmethod
+    async def _cleanup_component(component: Any) -> None:
+        if isinstance(component, Configurable):
+            await component.cleanup()
+
     async def cleanup(self) -> None:
         async with self.state.write_lock() as state:
-            if isinstance(state.processor, Configurable):
-                await state.processor.cleanup()
-            if isinstance(state.poster, Configurable):
-                await state.poster.cleanup()
-            if isinstance(state.scorer, Configurable):
-                await state.scorer.cleanup()
-            if isinstance(state.score_modifier, Configurable):
-                await state.score_modifier.cleanup()
-            if isinstance(state.scraper, Configurable):
-                await state.scraper.cleanup()
-            if isinstance(state.restriction, Configurable):
-                await state.restriction.cleanup()
-
-
-class TwitterFace(TwitterFaceBase, Categorizable, ABC):
+            await asyncio.gather(
+                self._cleanup_component(state.processor),
+                self._cleanup_component(state.poster),
+                self._cleanup_component(state.scorer),
+                self._cleanup_component(state.score_modifier),
+                self._cleanup_component(state.scraper),
+                self._cleanup_component(state.restriction),
+            )
+
+    async def close(self) -> None:
+        # resources shared across resets are only released on shutdown
+        await asyncio.gather(
+            self._client.close(),
+            close_http_client(),
+            background(ToxicityModelLoader.shutdown),
+        )
+
+
+class TwitterFace(TwitterFaceBase, CachedCategorizable, ABC):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def category(cls) -> str:
         name: str = cls.__name__
         return normalize(name.removesuffix("TwitterFace"))
 
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def metadata(cls) -> Metadata:
         return Metadata(
             key="kilroy-face-twitter", description="Kilroy face for Twitter"
         )
 
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def post_type(cls) -> str:
         return cls.category
 
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def post_schema(cls) -> JSONSchema:
         return Processor.for_category(cls.post_type).post_schema
 
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
+    def schema(cls) -> JSONSchema:
+        # built from class-level parameter schemas only, so it never changes
+        return super().schema
+
+    # noinspection PyMethodParameters
+    @cached_classproperty
     def parameters(cls) -> Set[Type[Parameter]]:
         return {
             PosterParameter,
@@ -450,65 +590,139 @@ class TwitterFace(TwitterFaceBase, Categorizable, ABC):
             RestrictionParameter,
         }
 
+    async def _snapshot_state(self) -> State:
+        # parameters replace components instead of modifying the state,
+        # so a shallow copy is consistent and the lock can be released
+        # before any slow calls are made, this is only safe because
+        # cleanup leaves the shared client open until close is called
+        async with self.state.read_lock() as state:
+            return copy(state)
+
     async def post(
         self, content: Dict[str, Any]
     ) -> Tuple[UUID, Optional[str]]:
         logger.info("Creating new post...")
 
-        async with self.state.read_lock() as state:
-            data = await state.processor.to_internal(content)
-            if state.restriction is not None:
-                if not await state.restriction.check(data):
-                    raise ValueError("Post is not allowed to be posted.")
-            post = await state.poster.post(state.client, data)
+        state = await self._snapshot_state()
+        data = await state.processor.to_internal(content)
+        if state.restriction is not None:
+            if not await state.restriction.check(data):
+                raise ValueError("Post is not allowed to be posted.")
+        post = await state.poster.post(state.client, data)
 
-        logger.info(f"New post id: {str(post.id)}.")
+        logger.info("New post id: %s.", post.id)
         return post.id, post.url
 
     async def score(self, id: UUID) -> float:
-        logger.info(f"Scoring post {str(id)}...")
+        logger.info("Scoring post %s...", id)
 
-        async with self.state.read_lock() as state:
-            fields = state.scorer.needed_fields
-            if state.score_modifier is not None:
-                fields = fields + state.score_modifier.needed_fields
-            response = await state.client.v2.get_tweet(
-                id.int,
-                user_auth=True,
-                **fields.to_kwargs(),
-            )
-            tweet = response.data
-            includes = TweetIncludes.from_response(response)
-            score = await state.scorer.score(state.client, tweet, includes)
-            if state.score_modifier is not None:
-                score = await state.score_modifier.modify(
-                    tweet, includes, score
-                )
-
-        logger.info(f"Score for post {str(id)}: {score}.")
+        state = await self._snapshot_state()
+        fields = state.score_fields
+        tweet, includes = await state.tweet_loader.load(id.int, fields)
+        score = await state.scorer.score(state.client, tweet, includes)
+        if state.score_modifier is not None:
+            score = await state.score_modifier.modify(tweet, includes, score)
+
+        logger.info("Score for post %s: %s.", id, score)
         return score
 
     @staticmethod
-    async def _fetch(
+    async def _process(
         client: TwitterClient,
-        tweets: AsyncIterable[Tuple[Tweet, TweetIncludes]],
+        tweet: Tweet,
+        includes: TweetIncludes,
         processor: Processor,
         scorer: Scorer,
         score_modifier: Optional[ScoreModifier],
-    ) -> AsyncIterable[Tuple[UUID, Dict[str, Any], float]]:
-        async for tweet, includes in tweets:
-            post_id = UUID(int=tweet.id)
+    ) -> Optional[Tuple[int, Dict[str, Any], float]]:
+        async def get_score() -> float:
             score = await scorer.score(client, tweet, includes)
             if score_modifier is not None:
                 score = await score_modifier.modify(tweet, includes, score)
+            return score
 
+        async def get_data() -> Optional[Dict[str, Any]]:
             try:
                 post = await Post.from_tweet(tweet, includes)
-                data = await processor.to_external(post.data)
+                return await processor.to_external(post.data)
             except Exception:
-                continue
+                return None
+
+        score_task = asyncio.create_task(get_score())
+        data_task = asyncio.create_task(get_data())
+        try:
+            score, data = await asyncio.gather(score_task, data_task)
+        finally:
+            # gather doesn't cancel the other half when one of them fails
+            score_task.cancel()
+            data_task.cancel()
+        if data is None:
+            return None
+        return tweet.id, data, score
+
+    @classmethod
+    async def _fetch(
+        cls,
+        client: TwitterClient,
+        tweets: AsyncIterable[Tuple[Tweet, TweetIncludes]],
+        processor: Processor,
+        scorer: Scorer,
+        score_modifier: Optional[ScoreModifier],
+        concurrency: int,
+    ) -> AsyncIterable[Tuple[int, Dict[str, Any], float]]:
+        # tweets are scraped and processed in the background,
+        # even while the consumer is busy with an already yielded result,
+        # results are still yielded in the original order
+        loop = asyncio.get_running_loop()
+        concurrency = max(concurrency, 1)
+        # the queue only bounds finished results that wait for the consumer,
+        # the semaphore bounds the tasks that are actually running
+        queue: asyncio.Queue[Optional[asyncio.Future]] = asyncio.Queue(
+            maxsize=concurrency
+        )
+        semaphore = asyncio.Semaphore(concurrency)
 
-            yield post_id, data, score
+        async def produce() -> None:
+            try:
+                async for tweet, includes in tweets:
+                    await semaphore.acquire()
+                    task = asyncio.create_task(
+                        cls._process(
+                            client,
+                            tweet,
+                            includes,
+                            processor,
+                            scorer,
+                            score_modifier,
+                        )
+                    )
+                    task.add_done_callback(lambda _: semaphore.release())
+                    try:
+                        await queue.put(task)
+                    except asyncio.CancelledError:
+                        task.cancel()
+                        raise
+            except Exception as e:
+                # scraping errors are passed to the consumer
+                failed = loop.create_future()
+                failed.set_exception(e)
+                await queue.put(failed)
+            else:
+                await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+
+        try:
+            while (future := await queue.get()) is not None:
+                result = await future
+                if result is not None:
+                    yield result
+        finally:
+            producer.cancel()
+            while not queue.empty():
+                future = queue.get_nowait()
+                if future is not None:
+                    future.cancel()
 
     async def scrap(
         self,
@@ -516,34 +730,30 @@ class TwitterFace(TwitterFaceBase, Categorizable, ABC):
         before: Optional[datetime] = None,
         after: Optional[datetime] = None,
     ) -> AsyncIterable[Tuple[UUID, Dict[str, Any], float]]:
-        async with self.state.read_lock() as state:
-            fields = TweetFields(tweet_fields=["id"])
-            fields = fields + state.processor.needed_fields
-            fields = fields + state.scorer.needed_fields
-            if state.score_modifier is not None:
-                fields = fields + state.score_modifier.needed_fields
-            tweets = state.scraper.scrap(state.client, fields, before, after)
-
-            posts = self._fetch(
-                state.client,
-                tweets,
-                state.processor,
-                state.scorer,
-                state.score_modifier,
-            )
-            if limit is not None:
-                posts = stream.take(posts, limit)
-            else:
-                posts = stream.iterate(posts)
+        state = await self._snapshot_state()
+        fields = state.scrap_fields
+        tweets = state.scraper.scrap(
+            state.client, fields, before, after, limit
+        )
+
+        posts = self._fetch(
+            state.client,
+            tweets,
+            state.processor,
+            state.scorer,
+            state.score_modifier,
+            self._params.scrap_concurrency,
+        )
 
-            logger.info("Scraping posts...")
+        logger.info("Scraping posts...")
 
-            async with posts.stream() as streamer:
-                async for post_id, post, score in streamer:
-                    logger.info(f"Scraped post {str(post_id)}.")
-                    yield post_id, post, score
+        async with aclosing(posts):
+            async for tweet_id, post, score in take(posts, limit):
+                post_id = UUID(int=tweet_id)
+                logger.info("Scraped post %s.", post_id)
+                yield post_id, post, score
 
-            logger.info("Scraping finished.")
+        logger.info("Scraping finished.")
 
     async def reset_self(self) -> None:
         logger.info("Resetting state...")
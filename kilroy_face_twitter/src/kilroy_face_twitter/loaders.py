@@ -0,0 +1,53 @@
+from operator import itemgetter
+from typing import List, Tuple, Union
+
+from tweepy import Tweet
+
+from kilroy_face_twitter.client import TwitterClient
+from kilroy_face_twitter.data import TweetFields, TweetIncludes
+from kilroy_face_twitter.utils import BatchLoader
+
+Key = Tuple[int, TweetFields]
+Result = Tuple[Tweet, TweetIncludes]
+
+
+# lookups with the same fields are fetched together with a single request
+class TweetLoader:
+    def __init__(
+        self,
+        client: TwitterClient,
+        max_batch_size: int = 100,
+        max_delay: float = 0.05,
+        cache_size: int = 10000,
+        cache_ttl: float = 60,
+    ) -> None:
+        self._client = client
+        self._loader: BatchLoader[Key, Result] = BatchLoader(
+            self._fetch,
+            group=itemgetter(1),
+            max_batch_size=max_batch_size,
+            max_delay=max_delay,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+        )
+
+    async def load(self, id: int, fields: TweetFields) -> Result:
+        return await self._loader.load((id, fields))
+
+    async def _fetch(self, keys: List[Key]) -> List[Union[Result, Exception]]:
+        fields = keys[0][1]
+        response = await self._client.v2.get_tweets(
+            [id for id, _ in keys], user_auth=True, **fields.to_kwargs()
+        )
+
+        includes = TweetIncludes.from_response(response)
+        tweets = {tweet.id: tweet for tweet in response.data or []}
+
+        results = []
+        for id, _ in keys:
+            tweet = tweets.get(id)
+            if tweet is None:
+                results.append(ValueError(f"Tweet {id} not found."))
+            else:
+                results.append((tweet, includes))
+        return results
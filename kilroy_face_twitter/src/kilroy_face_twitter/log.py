@@ -1,5 +1,8 @@
+import atexit
 import logging
 from enum import Enum
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 
 import typer
 
@@ -12,26 +15,47 @@ class Verbosity(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+LEVELS = {
+    Verbosity.DEBUG: logging.DEBUG,
+    Verbosity.INFO: logging.INFO,
+    Verbosity.WARNING: logging.WARNING,
+    Verbosity.ERROR: logging.ERROR,
+    Verbosity.CRITICAL: logging.CRITICAL,
+}
+
+
+COLORS = {
+    logging.DEBUG: typer.colors.BLACK,
+    logging.INFO: typer.colors.BLUE,
+    logging.WARNING: typer.colors.YELLOW,
+    logging.ERROR: typer.colors.RED,
+    logging.CRITICAL: typer.colors.BRIGHT_RED,
+}
+
+
 class TyperLoggerHandler(logging.Handler):
     def emit(self, record: logging.LogRecord) -> None:
-        fg = None
-        bg = None
-        if record.levelno == logging.DEBUG:
-            fg = typer.colors.BLACK
-        elif record.levelno == logging.INFO:
-            fg = typer.colors.BLUE
-        elif record.levelno == logging.WARNING:
-            fg = typer.colors.YELLOW
-        elif record.levelno == logging.CRITICAL:
-            fg = typer.colors.RED
-        elif record.levelno == logging.ERROR:
-            fg = typer.colors.RED
-        typer.secho(self.format(record), bg=bg, fg=fg)
-
-
-def configure(verbosity) -> None:
+        typer.secho(self.format(record), fg=COLORS.get(record.levelno))
+
+
+def configure(verbosity: Verbosity) -> None:
+    level = LEVELS[verbosity]
+    root = logging.getLogger()
+    if root.handlers:
+        # already configured, only the level can change
+        root.setLevel(level)
+        return
+
+    # records are only enqueued on the calling thread (e.g. the event loop),
+    # actual writing happens on the listener thread
+    queue = SimpleQueue()
+    handler = TyperLoggerHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s\t%(message)s"))
+    listener = QueueListener(queue, handler, respect_handler_level=True)
     logging.basicConfig(
-        format="%(levelname)s\t%(message)s",
-        level=verbosity.value,
-        handlers=[TyperLoggerHandler()],
+        format="%(message)s",
+        level=level,
+        handlers=[QueueHandler(queue)],
     )
+    listener.start()
+    atexit.register(listener.stop)
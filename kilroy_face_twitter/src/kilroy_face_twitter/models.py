@@ -1,30 +1,109 @@
 from threading import Lock
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, List
 
-from detoxify import Detoxify
+from kilroy_server_py_utils import background
+
+from kilroy_face_twitter.utils import BatchLoader
+
+if TYPE_CHECKING:
+    from detoxify import Detoxify
 
 
 def fetch_models() -> None:
     ToxicityModelLoader.get()
     ToxicityModelLoader.release()
+    ToxicityModelLoader.shutdown()
 
 
 class ToxicityModelLoader:
-    model: Optional[Detoxify] = None
-    reference_count: int = 0
+    # separate instances for the full and the reduced precision model
+    models: Dict[bool, "Detoxify"] = {}
+    reference_counts: Dict[bool, int] = {}
     lock: Lock = Lock()
 
     @classmethod
-    def get(cls) -> Detoxify:
+    def get(cls, quantize: bool = False) -> "Detoxify":
+        with cls.lock:
+            model = cls.models.get(quantize)
+            if model is None:
+                model = cls.models[quantize] = cls._load(quantize)
+            cls.reference_counts[quantize] = (
+                cls.reference_counts.get(quantize, 0) + 1
+            )
+            return model
+
+    @staticmethod
+    def _load(quantize: bool) -> "Detoxify":
+        # detoxify pulls in torch, so it is imported only when needed
+        import torch
+        from detoxify import Detoxify
+
+        if torch.cuda.is_available():
+            model = Detoxify("multilingual", device="cuda")
+            if quantize:
+                # half precision is much faster on gpu
+                model.model.half()
+        else:
+            model = Detoxify("multilingual")
+            if quantize:
+                # int8 weights for linear layers are much faster on cpu
+                model.model = torch.ao.quantization.quantize_dynamic(
+                    model.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+        # first inference initializes kernels and is much slower,
+        # so it's done here instead of in the first real prediction
+        model.predict(["warmup"])
+        return model
+
+    @classmethod
+    def release(cls, quantize: bool = False) -> None:
+        # the model stays loaded even when unused,
+        # reloading it is much slower than keeping it in memory
         with cls.lock:
-            if cls.model is None:
-                cls.model = Detoxify("multilingual")
-            cls.reference_count += 1
-            return cls.model
+            cls.reference_counts[quantize] -= 1
 
     @classmethod
-    def release(cls) -> None:
+    def shutdown(cls) -> None:
         with cls.lock:
-            cls.reference_count -= 1
-            if cls.reference_count == 0:
-                cls.model = None
+            for quantize, count in cls.reference_counts.items():
+                if count == 0:
+                    cls.models.pop(quantize, None)
+
+
+# predictions requested within a short time window
+# are computed together in a single forward pass,
+# inference runs in background to keep the event loop free,
+# callers shouldn't hold their state lock while waiting for predictions,
+# otherwise config changes would wait for inference to finish
+class ToxicityPredictor:
+    def __init__(
+        self,
+        model: "Detoxify",
+        max_batch_size: int = 32,
+        max_delay: float = 0.01,
+        cache_size: int = 10000,
+    ) -> None:
+        self._model = model
+        self._loader: BatchLoader[str, float] = BatchLoader(
+            self._predict,
+            max_batch_size=max_batch_size,
+            max_delay=max_delay,
+            cache_size=cache_size,
+        )
+
+    async def predict(self, text: str) -> float:
+        return await self._loader.load(text)
+
+    async def _predict(self, texts: List[str]) -> List[float]:
+        results = await background(self._model.predict, texts)
+        return results["toxicity"]
+
+
+async def get_predictor(quantize: bool = False) -> ToxicityPredictor:
+    return ToxicityPredictor(
+        await background(ToxicityModelLoader.get, quantize)
+    )
+
+
+async def release_predictor(quantize: bool = False) -> None:
+    await background(ToxicityModelLoader.release, quantize)
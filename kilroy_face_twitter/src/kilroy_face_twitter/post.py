@@ -2,7 +2,7 @@ from typing import Optional
 from uuid import UUID
 
 from kilroy_face_py_shared import SerializableModel
-from kilroy_server_py_utils import base64_encode
+from kilroy_server_py_utils import background, base64_encode
 from tweepy import Tweet
 
 from kilroy_face_twitter.data import TweetIncludes
@@ -38,16 +38,13 @@ class Post(SerializableModel):
         if len(media_keys) > 0:
             media_key = media_keys[0]
             try:
-                image_url = next(
-                    media.url
-                    for media in includes.media
-                    if media.media_key == media_key
-                )
+                image_url = includes.get_media(media_key).url
+                image_bytes = await download_image(image_url)
                 image = PostImageData(
-                    raw=base64_encode(await download_image(image_url)),
+                    raw=await background(base64_encode, image_bytes),
                     filename=get_filename_from_url(image_url),
                 )
-            except StopIteration:
+            except KeyError:
                 pass
         return cls(
             data=PostData(text=text, image=image),
@@ -3,20 +3,20 @@ from io import BytesIO
 from uuid import UUID
 
 from kilroy_server_py_utils import (
-    Categorizable,
-    classproperty,
     normalize,
     base64_decode,
+    background,
 )
-from tweepy import Tweet, User
+from tweepy import Tweet
 
 from kilroy_face_twitter.client import TwitterClient
-from kilroy_face_twitter.post import PostData, Post
+from kilroy_face_twitter.post import PostData, PostImageData, Post
+from kilroy_face_twitter.utils import CachedCategorizable, cached_classproperty
 
 
-class Poster(Categorizable, ABC):
+class Poster(CachedCategorizable, ABC):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def category(cls) -> str:
         name: str = cls.__name__
         return normalize(name.removesuffix("Poster"))
@@ -30,21 +30,24 @@ class Poster(Categorizable, ABC):
 
 
 class BasicPoster(Poster):
+    @staticmethod
+    def _upload(client: TwitterClient, image: PostImageData) -> int:
+        image_bytes = base64_decode(image.raw)
+        with BytesIO(image_bytes) as file:
+            media = client.v1.media_upload(file=file, filename=image.filename)
+        return media.media_id
+
     async def post(self, client: TwitterClient, data: PostData) -> Post:
         kwargs = {}
         if data.text is not None:
             kwargs["text"] = data.text.content
         if data.image is not None:
-            image_bytes = base64_decode(data.image.raw)
-            with BytesIO(image_bytes) as file:
-                media = client.v1.media_upload(
-                    file=file, filename=data.image.filename
-                )
-            kwargs["media_ids"] = [media.media_id]
+            # decoding and uploading are blocking, so they run in background
+            media_id = await background(self._upload, client, data.image)
+            kwargs["media_ids"] = [media_id]
         response = await client.v2.create_tweet(**kwargs)
         tweet = Tweet(response.data)
-        response = await client.v2.get_me()
-        user = User(response.data)
+        user = await client.me()
         return Post(
             data=data,
             id=UUID(int=tweet.id),
@@ -1,9 +1,7 @@
-import json
 from abc import ABC, abstractmethod
 from typing import Any, Dict
 
 from kilroy_face_server_py_sdk import (
-    Categorizable,
     ImageData,
     ImageOnlyPost,
     ImageWithOptionalTextPost,
@@ -19,6 +17,7 @@ from kilroy_face_server_py_sdk import (
 
 from kilroy_face_twitter.data import TweetFields
 from kilroy_face_twitter.post import PostData, PostTextData, PostImageData
+from kilroy_face_twitter.utils import CachedCategorizable, cached_classproperty
 
 TEXT_FIELDS = TweetFields(tweet_fields=["text"])
 IMAGE_FIELDS = TweetFields(
@@ -26,11 +25,12 @@ IMAGE_FIELDS = TweetFields(
     media_fields=["url"],
     tweet_fields=["attachments"],
 )
+TEXT_AND_IMAGE_FIELDS = TEXT_FIELDS + IMAGE_FIELDS
 
 
-class Processor(Categorizable, ABC):
+class Processor(CachedCategorizable, ABC):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def category(cls) -> str:
         name: str = cls.__name__
         return normalize(name.removesuffix("Processor"))
@@ -61,7 +61,7 @@ class Processor(Categorizable, ABC):
 
 class TextOnlyProcessor(Processor):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def post_schema(cls) -> JSONSchema:
         return JSONSchema(**TextOnlyPost.schema())
 
@@ -75,8 +75,10 @@ class TextOnlyProcessor(Processor):
             raise ValueError("Text data is required in this post type.")
         if data.image is not None:
             raise ValueError("Image data is not allowed in this post type.")
-        post = TextOnlyPost(text=TextData(content=data.text.content))
-        return json.loads(post.json())
+        post = TextOnlyPost.construct(
+            text=TextData.construct(content=data.text.content)
+        )
+        return post.dict(by_alias=True)
 
     async def to_internal(self, data: Dict[str, Any]) -> PostData:
         post = TextOnlyPost.parse_obj(data)
@@ -88,7 +90,7 @@ class TextOnlyProcessor(Processor):
 
 class ImageOnlyProcessor(Processor):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def post_schema(cls) -> JSONSchema:
         return JSONSchema(**ImageOnlyPost.schema())
 
@@ -102,10 +104,12 @@ class ImageOnlyProcessor(Processor):
             raise ValueError("Text data is not allowed in this post type.")
         if data.image is None:
             raise ValueError("Image data is required in this post type.")
-        post = ImageOnlyPost(
-            image=ImageData(raw=data.image.raw, filename=data.image.filename)
+        post = ImageOnlyPost.construct(
+            image=ImageData.construct(
+                raw=data.image.raw, filename=data.image.filename
+            )
         )
-        return json.loads(post.json())
+        return post.dict(by_alias=True)
 
     async def to_internal(self, data: Dict[str, Any]) -> PostData:
         post = ImageOnlyPost.parse_obj(data)
@@ -121,23 +125,25 @@ class ImageOnlyProcessor(Processor):
 
 class TextAndImageProcessor(Processor):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def post_schema(cls) -> JSONSchema:
         return JSONSchema(**TextAndImagePost.schema())
 
     # noinspection PyMethodParameters
     @classproperty
     def needed_fields(cls) -> TweetFields:
-        return TEXT_FIELDS + IMAGE_FIELDS
+        return TEXT_AND_IMAGE_FIELDS
 
     async def to_external(self, data: PostData) -> Dict[str, Any]:
         if data.text is None or data.image is None:
             raise ValueError("Text and image data are required.")
-        post = TextAndImagePost(
-            text=TextData(content=data.text.content),
-            image=ImageData(raw=data.image.raw, filename=data.image.filename),
+        post = TextAndImagePost.construct(
+            text=TextData.construct(content=data.text.content),
+            image=ImageData.construct(
+                raw=data.image.raw, filename=data.image.filename
+            ),
         )
-        return json.loads(post.json())
+        return post.dict(by_alias=True)
 
     async def to_internal(self, data: Dict[str, Any]) -> PostData:
         post = TextAndImagePost.parse_obj(data)
@@ -154,25 +160,29 @@ class TextAndImageProcessor(Processor):
 
 class TextOrImageProcessor(Processor):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def post_schema(cls) -> JSONSchema:
         return JSONSchema(**TextOrImagePost.schema())
 
     # noinspection PyMethodParameters
     @classproperty
     def needed_fields(cls) -> TweetFields:
-        return TEXT_FIELDS + IMAGE_FIELDS
+        return TEXT_AND_IMAGE_FIELDS
 
     async def to_external(self, data: PostData) -> Dict[str, Any]:
         if data.text is None and data.image is None:
             raise ValueError("Either text or image data is required.")
-        post = TextOrImagePost(
-            text=TextData(content=data.text.content) if data.text else None,
-            image=ImageData(raw=data.image.raw, filename=data.image.filename)
+        post = TextOrImagePost.construct(
+            text=TextData.construct(content=data.text.content)
+            if data.text
+            else None,
+            image=ImageData.construct(
+                raw=data.image.raw, filename=data.image.filename
+            )
             if data.image
             else None,
         )
-        return json.loads(post.json())
+        return post.dict(by_alias=True)
 
     async def to_internal(self, data: Dict[str, Any]) -> PostData:
         post = TextOrImagePost.parse_obj(data)
@@ -194,25 +204,27 @@ class TextOrImageProcessor(Processor):
 
 class TextWithOptionalImageProcessor(Processor):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def post_schema(cls) -> JSONSchema:
         return JSONSchema(**TextWithOptionalImagePost.schema())
 
     # noinspection PyMethodParameters
     @classproperty
     def needed_fields(cls) -> TweetFields:
-        return TEXT_FIELDS + IMAGE_FIELDS
+        return TEXT_AND_IMAGE_FIELDS
 
     async def to_external(self, data: PostData) -> Dict[str, Any]:
         if data.text is None:
             raise ValueError("Text data is required.")
-        post = TextWithOptionalImagePost(
-            text=TextData(content=data.text.content),
-            image=ImageData(raw=data.image.raw, filename=data.image.filename)
+        post = TextWithOptionalImagePost.construct(
+            text=TextData.construct(content=data.text.content),
+            image=ImageData.construct(
+                raw=data.image.raw, filename=data.image.filename
+            )
             if data.image
             else None,
         )
-        return json.loads(post.json())
+        return post.dict(by_alias=True)
 
     async def to_internal(self, data: Dict[str, Any]) -> PostData:
         post = TextWithOptionalImagePost.parse_obj(data)
@@ -230,23 +242,27 @@ class TextWithOptionalImageProcessor(Processor):
 
 class ImageWithOptionalTextProcessor(Processor):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def post_schema(cls) -> JSONSchema:
         return JSONSchema(**ImageWithOptionalTextPost.schema())
 
     # noinspection PyMethodParameters
     @classproperty
     def needed_fields(cls) -> TweetFields:
-        return TEXT_FIELDS + IMAGE_FIELDS
+        return TEXT_AND_IMAGE_FIELDS
 
     async def to_external(self, data: PostData) -> Dict[str, Any]:
         if data.image is None:
             raise ValueError("Image data is required.")
-        post = ImageWithOptionalTextPost(
-            text=TextData(content=data.text.content) if data.text else None,
-            image=ImageData(raw=data.image.raw, filename=data.image.filename),
+        post = ImageWithOptionalTextPost.construct(
+            text=TextData.construct(content=data.text.content)
+            if data.text
+            else None,
+            image=ImageData.construct(
+                raw=data.image.raw, filename=data.image.filename
+            ),
         )
-        return json.loads(post.json())
+        return post.dict(by_alias=True)
 
     async def to_internal(self, data: Dict[str, Any]) -> PostData:
         post = ImageWithOptionalTextPost.parse_obj(data)
@@ -1,6 +1,10 @@
-from importlib.resources import path
+from functools import lru_cache
+from importlib.resources import as_file, files
 from pathlib import Path, PurePath
-from typing import ContextManager, Tuple, Union
+from typing import TYPE_CHECKING, ContextManager, Tuple, Union
+
+if TYPE_CHECKING:
+    from importlib.resources.abc import Traversable
 
 
 def extract_resource_path(
@@ -19,24 +23,29 @@ def extract_resource_path(
     return ".".join(resource_path.parent.parts), resource_path.name
 
 
-def resource(resource_path: Union[str, PurePath]) -> ContextManager[Path]:
-    """Wrapper to importlib.resources.path with package part filled."""
+def resource_file(resource_path: Union[str, PurePath]) -> "Traversable":
+    """Wrapper to importlib.resources.files with package part filled."""
     package_part, resource_name = extract_resource_path(resource_path)
     package_part = f"{__name__}{'.' + package_part if package_part else ''}"
-    return path(package_part, resource_name)
+    return files(package_part).joinpath(resource_name)
+
+
+def resource(resource_path: Union[str, PurePath]) -> ContextManager[Path]:
+    """Wrapper to importlib.resources.as_file that uses resource_file(resource_path)."""
+    return as_file(resource_file(resource_path))
 
 
+@lru_cache(maxsize=None)
 def resource_bytes(resource_path: Union[str, PurePath]) -> bytes:
-    """Wrapper to Path.read_bytes() that uses resource(resource_path)."""
-    with resource(resource_path) as r:
-        return r.read_bytes()
+    """Wrapper to Traversable.read_bytes() that uses resource_file(resource_path)."""
+    return resource_file(resource_path).read_bytes()
 
 
+@lru_cache(maxsize=None)
 def resource_text(
     resource_path: Union[str, PurePath],
     encoding: str = None,
     errors: str = None,
 ) -> str:
-    """Wrapper to Path.read_text() that uses resource(resource_path)."""
-    with resource(resource_path) as r:
-        return r.read_text(encoding, errors)
+    """Wrapper to Traversable.read_text() that uses resource_file(resource_path)."""
+    return resource_file(resource_path).read_text(encoding, errors)
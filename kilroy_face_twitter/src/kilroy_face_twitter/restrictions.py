@@ -1,21 +1,29 @@
-import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict
 
-from detoxify import Detoxify
 from kilroy_face_py_shared import SerializableModel
-from kilroy_face_server_py_sdk import Categorizable, classproperty, normalize
-from kilroy_server_py_utils import Configurable, Parameter, background
-
-from kilroy_face_twitter.models import ToxicityModelLoader
+from kilroy_face_server_py_sdk import classproperty, normalize
+from kilroy_server_py_utils import Configurable, Parameter
+
+from kilroy_face_twitter.models import (
+    ToxicityPredictor,
+    get_predictor,
+    release_predictor,
+)
 from kilroy_face_twitter.post import PostData
+from kilroy_face_twitter.utils import (
+    CachedCategorizable,
+    cached_classproperty,
+    load_state_dict,
+    save_state_dict,
+)
 
 
-class Restriction(Categorizable, ABC):
+class Restriction(CachedCategorizable, ABC):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def category(cls) -> str:
         name: str = cls.__name__
         return normalize(name.removesuffix("Restriction"))
@@ -30,11 +38,13 @@ class Restriction(Categorizable, ABC):
 
 class ToxicityRestrictionParams(SerializableModel):
     threshold: float = 0.8
+    # reduced precision model is faster, but its scores are not the same
+    quantize: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ToxicityRestrictionState:
-    detoxify: Detoxify
+    predictor: ToxicityPredictor
     threshold: float
 
 
@@ -54,7 +64,7 @@ class ToxicityRestriction(Restriction, Configurable[ToxicityRestrictionState]):
     async def _build_default_state(self) -> ToxicityRestrictionState:
         params = ToxicityRestrictionParams(**self._kwargs)
         return ToxicityRestrictionState(
-            detoxify=await background(ToxicityModelLoader.get),
+            predictor=await get_predictor(params.quantize),
             threshold=params.threshold,
         )
 
@@ -63,26 +73,27 @@ class ToxicityRestriction(Restriction, Configurable[ToxicityRestrictionState]):
         cls, state: ToxicityRestrictionState, directory: Path
     ) -> None:
         state_dict = {"threshold": state.threshold}
-        with open(directory / "state.json", "w") as f:
-            json.dump(state_dict, f)
+        await save_state_dict(state_dict, directory)
 
     async def _load_saved_state(
         self, directory: Path
     ) -> ToxicityRestrictionState:
         params = ToxicityRestrictionParams(**self._kwargs)
-        with open(directory / "state.json", "r") as f:
-            state_dict = json.load(f)
+        state_dict = await load_state_dict(directory)
         return ToxicityRestrictionState(
-            detoxify=await background(ToxicityModelLoader.get),
+            predictor=await get_predictor(params.quantize),
             threshold=state_dict.get("threshold", params.threshold),
         )
 
     async def cleanup(self) -> None:
-        await background(ToxicityModelLoader.release)
+        params = ToxicityRestrictionParams(**self._kwargs)
+        await release_predictor(params.quantize)
 
     async def check(self, data: PostData) -> bool:
         if data.text is None:
             return True
         async with self.state.read_lock() as state:
-            toxicity = state.detoxify.predict(data.text.content)["toxicity"]
-            return toxicity < state.threshold
+            predictor = state.predictor
+            threshold = state.threshold
+        toxicity = await predictor.predict(data.text.content)
+        return toxicity < threshold
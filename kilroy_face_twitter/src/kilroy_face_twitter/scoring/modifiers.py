@@ -1,23 +1,32 @@
-import json
+import math
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Tuple
 
-import numpy as np
-from detoxify import Detoxify
 from kilroy_face_py_shared import SerializableModel
-from kilroy_face_server_py_sdk import Categorizable, classproperty, normalize
-from kilroy_server_py_utils import Configurable, Parameter, background
+from kilroy_face_server_py_sdk import classproperty, normalize
+from kilroy_server_py_utils import Configurable, Parameter
 from tweepy import Tweet
 
 from kilroy_face_twitter.data import TweetFields, TweetIncludes
-from kilroy_face_twitter.models import ToxicityModelLoader
-
-
-class ScoreModifier(Categorizable, ABC):
+from kilroy_face_twitter.models import (
+    ToxicityPredictor,
+    get_predictor,
+    release_predictor,
+)
+from kilroy_face_twitter.utils import (
+    CachedCategorizable,
+    cached_classproperty,
+    load_state_dict,
+    save_state_dict,
+)
+
+
+class ScoreModifier(CachedCategorizable, ABC):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def category(cls) -> str:
         name: str = cls.__name__
         return normalize(name.removesuffix("ScoreModifier"))
@@ -38,14 +47,22 @@ class ScoreModifier(Categorizable, ABC):
 # Toxicity
 
 
+# exponents only change with the parameters, not with every tweet
+@lru_cache(maxsize=16)
+def _exponents(threshold: float, alpha: float) -> Tuple[float, float]:
+    return -math.log(2) / math.log(threshold), 1 / (1 - alpha)
+
+
 class ToxicityScoreModifierParams(SerializableModel):
     threshold: float = 0.8
     alpha: float = 0.9
+    # reduced precision model is faster, but its scores are not the same
+    quantize: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ToxicityScoreModifierState:
-    detoxify: Detoxify
+    predictor: ToxicityPredictor
     threshold: float
     alpha: float
 
@@ -80,7 +97,7 @@ class ToxicityScoreModifier(
     async def _build_default_state(self) -> ToxicityScoreModifierState:
         params = ToxicityScoreModifierParams(**self._kwargs)
         return ToxicityScoreModifierState(
-            detoxify=await background(ToxicityModelLoader.get),
+            predictor=await get_predictor(params.quantize),
             threshold=params.threshold,
             alpha=params.alpha,
         )
@@ -93,26 +110,25 @@ class ToxicityScoreModifier(
             "threshold": state.threshold,
             "alpha": state.alpha,
         }
-        with open(directory / "state.json", "w") as f:
-            json.dump(state_dict, f)
+        await save_state_dict(state_dict, directory)
 
     async def _load_saved_state(
         self, directory: Path
     ) -> ToxicityScoreModifierState:
         params = ToxicityScoreModifierParams(**self._kwargs)
-        with open(directory / "state.json", "r") as f:
-            state_dict = json.load(f)
+        state_dict = await load_state_dict(directory)
         return ToxicityScoreModifierState(
-            detoxify=await background(ToxicityModelLoader.get),
+            predictor=await get_predictor(params.quantize),
             threshold=state_dict.get("threshold", params.threshold),
             alpha=state_dict.get("alpha", params.alpha),
         )
 
     async def cleanup(self) -> None:
-        await background(ToxicityModelLoader.release)
+        params = ToxicityScoreModifierParams(**self._kwargs)
+        await release_predictor(params.quantize)
 
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def needed_fields(cls) -> TweetFields:
         return TweetFields(tweet_fields=["text"])
 
@@ -122,16 +138,17 @@ class ToxicityScoreModifier(
         if tweet.text is None:
             return score
         async with self.state.read_lock() as state:
-            toxicity = state.detoxify.predict(tweet.text)["toxicity"]
+            predictor = state.predictor
             threshold = state.threshold
             alpha = state.alpha
+        toxicity = await predictor.predict(tweet.text)
         return self.modifier(toxicity, threshold, alpha) * score
 
     @staticmethod
     def modifier(x: float, threshold: float, alpha: float) -> float:
-        x = np.clip(x, 0, 1).item()
-        threshold = np.clip(threshold, 0, 1).item()
-        alpha = np.clip(alpha, 0, 1).item()
+        x = min(max(x, 0), 1)
+        threshold = min(max(threshold, 0), 1)
+        alpha = min(max(alpha, 0), 1)
 
         if x == 0 or x == 1:
             return 1 - x
@@ -142,8 +159,7 @@ class ToxicityScoreModifier(
         if alpha == 1 and x == threshold:
             return 1
 
-        inner_exponent = (-np.log(2) / np.log(threshold)).item()
-        outer_exponent = 1 / (1 - alpha)
+        inner_exponent, outer_exponent = _exponents(threshold, alpha)
         inner_value = x**inner_exponent
         denominator = 1 + (inner_value / (1 - inner_value)) ** outer_exponent
         return 1 / denominator
@@ -1,15 +1,16 @@
 from abc import ABC, abstractmethod
 
-from kilroy_face_server_py_sdk import Categorizable, classproperty, normalize
+from kilroy_face_server_py_sdk import classproperty, normalize
 from tweepy import Tweet
 
 from kilroy_face_twitter.client import TwitterClient
 from kilroy_face_twitter.data import TweetFields, TweetIncludes
+from kilroy_face_twitter.utils import CachedCategorizable, cached_classproperty
 
 
-class Scorer(Categorizable, ABC):
+class Scorer(CachedCategorizable, ABC):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def category(cls) -> str:
         name: str = cls.__name__
         return normalize(name.removesuffix("Scorer"))
@@ -35,14 +36,12 @@ class RelativeLikesScorer(Scorer):
         self, client: TwitterClient, tweet: Tweet, includes: TweetIncludes
     ) -> float:
         likes = tweet.public_metrics["like_count"]
-        author = next(
-            user for user in includes.users if user.id == tweet.author_id
-        )
+        author = includes.get_user(tweet.author_id)
         followers = author.public_metrics["followers_count"]
         return likes / max(followers, 1)
 
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def needed_fields(cls) -> TweetFields:
         return TweetFields(
             expansions=["author_id"],
@@ -59,14 +58,12 @@ class RelativeRetweetsScorer(Scorer):
         self, client: TwitterClient, tweet: Tweet, includes: TweetIncludes
     ) -> float:
         retweets = tweet.public_metrics["retweet_count"]
-        author = next(
-            user for user in includes.users if user.id == tweet.author_id
-        )
+        author = includes.get_user(tweet.author_id)
         followers = author.public_metrics["followers_count"]
         return retweets / max(followers, 1)
 
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def needed_fields(cls) -> TweetFields:
         return TweetFields(
             expansions=["author_id"],
@@ -83,14 +80,12 @@ class RelativeImpressionsScorer(Scorer):
         self, client: TwitterClient, tweet: Tweet, includes: TweetIncludes
     ) -> float:
         impressions = tweet.non_public_metrics["impression_count"] or 0
-        author = next(
-            user for user in includes.users if user.id == tweet.author_id
-        )
+        author = includes.get_user(tweet.author_id)
         followers = author.public_metrics["followers_count"]
         return impressions / max(followers, 1)
 
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def needed_fields(cls) -> TweetFields:
         return TweetFields(
             expansions=["author_id"],
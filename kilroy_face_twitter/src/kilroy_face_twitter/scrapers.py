@@ -1,17 +1,22 @@
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import AsyncIterable, Optional, Tuple
 
-from kilroy_face_server_py_sdk import Categorizable, classproperty, normalize
+from kilroy_face_server_py_sdk import normalize
 from tweepy import Tweet
 
 from kilroy_face_twitter.client import TwitterClient
 from kilroy_face_twitter.data import TweetFields, TweetIncludes
+from kilroy_face_twitter.utils import CachedCategorizable, cached_classproperty
 
+# maximum page size allowed by the API, also its default
+TWEETS_PER_PAGE = 100
 
-class Scraper(Categorizable, ABC):
+
+class Scraper(CachedCategorizable, ABC):
     # noinspection PyMethodParameters
-    @classproperty
+    @cached_classproperty
     def category(cls) -> str:
         name: str = cls.__name__
         return normalize(name.removesuffix("Scraper"))
@@ -23,30 +28,53 @@ class Scraper(Categorizable, ABC):
         fields: TweetFields,
         before: Optional[datetime] = None,
         after: Optional[datetime] = None,
+        limit: Optional[int] = None,
     ) -> AsyncIterable[Tuple[Tweet, TweetIncludes]]:
+        # limit is only a hint of how many tweets will be consumed,
+        # more can be yielded, the consumer stops when it has enough
         pass
 
 
 # Timeline
 
+TIMELINE_FIELDS = TweetFields(
+    expansions=["author_id"],
+    tweet_fields=["author_id", "referenced_tweets", "text"],
+)
+
 
 class TimelineScraper(Scraper):
+    @staticmethod
+    def _is_original(tweet: Tweet, my_id: int) -> bool:
+        if tweet.author_id == my_id:
+            return False
+        if tweet.referenced_tweets is not None:
+            return False
+        if tweet.text is not None and tweet.text.startswith("RT @"):
+            return False
+        return True
+
     async def scrap(
         self,
         client: TwitterClient,
         fields: TweetFields,
         before: Optional[datetime] = None,
         after: Optional[datetime] = None,
+        limit: Optional[int] = None,
     ) -> AsyncIterable[Tuple[Tweet, TweetIncludes]]:
-        response = await client.v2.get_me(user_fields=["id"])
-        me = response.data
+        me = await client.me()
+        my_id = me.id
+
+        fields = fields + TIMELINE_FIELDS
 
-        fields = fields + TweetFields(
-            expansions=["author_id"],
-            tweet_fields=["author_id", "referenced_tweets", "text"],
-        )
+        page_size = TWEETS_PER_PAGE
+        if limit is not None:
+            page_size = min(max(limit, 1), TWEETS_PER_PAGE)
 
-        params = {"exclude": ["retweets", "replies"]}
+        params = {
+            "exclude": ["retweets", "replies"],
+            "max_results": page_size,
+        }
         if after is not None:
             params["start_time"] = after
         if before is not None:
@@ -55,21 +83,40 @@ class TimelineScraper(Scraper):
             if values is not None:
                 params[name] = values
 
-        while True:
-            response = await client.v2.get_home_timeline(**params)
-            includes = TweetIncludes.from_response(response)
-
-            for tweet in response.data or []:
-                if tweet.author_id == me.id:
-                    continue
-                if tweet.referenced_tweets is not None:
-                    continue
-                if tweet.text is not None and tweet.text.startswith("RT @"):
-                    continue
-
-                yield tweet, includes
-
-            if "next_token" not in response.meta:
-                break
-
-            params["pagination_token"] = response.meta["next_token"]
+        count = 0
+        next_page = asyncio.create_task(client.v2.get_home_timeline(**params))
+
+        try:
+            while next_page is not None:
+                response = await next_page
+                next_page = None
+
+                tweets = [
+                    tweet
+                    for tweet in response.data or []
+                    if self._is_original(tweet, my_id)
+                ]
+
+                next_token = response.meta.get("next_token")
+                if next_token is not None:
+                    params["pagination_token"] = next_token
+                    # the next page is requested while the current one
+                    # is consumed, unless the current one is probably enough
+                    if limit is None or count + len(tweets) < limit:
+                        next_page = asyncio.create_task(
+                            client.v2.get_home_timeline(**params)
+                        )
+
+                if tweets:
+                    includes = TweetIncludes.from_response(response)
+                    for tweet in tweets:
+                        yield tweet, includes
+                        count += 1
+
+                if next_page is None and next_token is not None:
+                    next_page = asyncio.create_task(
+                        client.v2.get_home_timeline(**params)
+                    )
+        finally:
+            if next_page is not None:
+                next_page.cancel()
@@ -0,0 +1,42 @@
+import asyncio
+import time
+from typing import Any, Optional
+
+from tweepy.asynchronous import AsyncClient
+
+
+class RateLimiter:
+    # spaces out calls evenly instead of letting them burst
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        self._interval = 1 / rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+            self._next = max(now, self._next) + self._interval
+
+
+class ThrottledAsyncClient(AsyncClient):
+    def __init__(
+        self,
+        *args: Any,
+        max_requests_per_second: Optional[float] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._limiter = (
+            RateLimiter(max_requests_per_second)
+            if max_requests_per_second is not None
+            else None
+        )
+
+    async def request(self, *args: Any, **kwargs: Any) -> Any:
+        if self._limiter is not None:
+            await self._limiter.wait()
+        return await super().request(*args, **kwargs)
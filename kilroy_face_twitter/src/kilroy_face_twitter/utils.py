@@ -1,14 +1,236 @@
+import asyncio
+import json
+import math
+import time
+from abc import ABC
+from collections import OrderedDict
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 from pathlib import Path
-from urllib.parse import urlparse
+from weakref import WeakKeyDictionary
 
 import httpx
+from kilroy_server_py_utils import Categorizable, background, classproperty
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# maximum number of simultaneous connections for downloading images
+MAX_DOWNLOAD_CONNECTIONS = 64
+
+# one pooled client per event loop, connections can't be shared between loops
+_http_clients: WeakKeyDictionary[
+    asyncio.AbstractEventLoop, httpx.AsyncClient
+] = WeakKeyDictionary()
+
+
+class cached_classproperty(classproperty):
+    # value is computed once for each class it is accessed on
+    def __init__(self, method=None):
+        super().__init__(method)
+        self._values: Dict[type, Any] = {}
+
+    def __get__(self, instance, cls=None):
+        if cls is None:
+            cls = type(instance)
+        if cls not in self._values:
+            self._values[cls] = super().__get__(instance, cls)
+        return self._values[cls]
+
+
+class CachedCategorizable(Categorizable, ABC):
+    # subclasses are all defined at import time,
+    # so the lookup result for a category never changes
+    @classmethod
+    @lru_cache(maxsize=None)
+    def for_category(cls: Type[T], category: str) -> Type[T]:
+        return super().for_category(category)
+
+
+# loads of keys from the same group requested within a short time window
+# are fetched together with a single call,
+# concurrent loads of the same key share one pending result,
+# recent results are served from a cache
+class BatchLoader(Generic[K, V]):
+    def __init__(
+        self,
+        fetch: Callable[[List[K]], Awaitable[Sequence[Union[V, Exception]]]],
+        group: Callable[[K], Hashable] = lambda key: None,
+        max_batch_size: int = 100,
+        max_delay: float = 0.01,
+        cache_size: int = 10000,
+        cache_ttl: Optional[float] = None,
+    ) -> None:
+        self._fetch = fetch
+        self._group = group
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._cache_size = cache_size
+        self._cache_ttl = math.inf if cache_ttl is None else cache_ttl
+        self._batches: Dict[Hashable, List[Tuple[K, asyncio.Future]]] = {}
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._cache: OrderedDict[K, Tuple[float, V]] = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _get_cached(self, key: K) -> Tuple[bool, Optional[V]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._cache[key]
+            return False, None
+        self._cache.move_to_end(key)
+        return True, value
+
+    def _set_cached(self, key: K, value: V) -> None:
+        if self._cache_size <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self._cache_ttl, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def load(self, key: K) -> V:
+        found, value = self._get_cached(key)
+        if found:
+            return value
+
+        future = self._pending.get(key)
+        if future is None:
+            future = self._enqueue(key)
+
+        # shielded so that one cancelled caller doesn't cancel the others
+        return await asyncio.shield(future)
+
+    def _enqueue(self, key: K) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = future
+
+        group = self._group(key)
+        batch = self._batches.get(group)
+        if batch is None:
+            batch = self._batches[group] = []
+            loop.call_later(self._max_delay, self._flush, group, batch)
+
+        batch.append((key, future))
+        if len(batch) >= self._max_batch_size:
+            self._flush(group, batch)
+
+        return future
+
+    def _flush(
+        self, group: Hashable, batch: List[Tuple[K, asyncio.Future]]
+    ) -> None:
+        if self._batches.get(group) is not batch:
+            # already flushed because it was full
+            return
+        del self._batches[group]
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[K, asyncio.Future]]) -> None:
+        try:
+            values = await self._fetch([key for key, _ in batch])
+        except Exception as e:
+            for key, future in batch:
+                del self._pending[key]
+                future.set_exception(e)
+            return
+
+        for (key, future), value in zip(batch, values):
+            del self._pending[key]
+            if isinstance(value, Exception):
+                future.set_exception(value)
+            else:
+                self._set_cached(key, value)
+                future.set_result(value)
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _http_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=MAX_DOWNLOAD_CONNECTIONS)
+        )
+    return client
+
+
+async def close_http_client() -> None:
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def _download(urls: List[str]) -> List[bytes]:
+    response = await _get_http_client().get(urls[0])
+    return [response.content]
+
+
+# images are not batched or cached,
+# only concurrent downloads of the same url are shared
+_downloader: BatchLoader[str, bytes] = BatchLoader(
+    _download, max_batch_size=1, cache_size=0
+)
 
 
 async def download_image(url: str) -> bytes:
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
-        return response.content
+    return await _downloader.load(url)
 
 
 def get_filename_from_url(url: str) -> str:
-    return Path(urlparse(url).path).name
+    path = url.partition("?")[0].partition("#")[0]
+    return path.rpartition("/")[2]
+
+
+async def take(
+    iterable: AsyncIterable[T], n: Optional[int]
+) -> AsyncIterable[T]:
+    if n is not None and n <= 0:
+        return
+    count = 0
+    async for item in iterable:
+        yield item
+        count += 1
+        if n is not None and count >= n:
+            return
+
+
+async def save_state_dict(
+    state_dict: Dict[str, Any], directory: Path, name: str = "state.json"
+) -> None:
+    # encoding in one go is much faster than streaming chunks to a file,
+    # file access happens in the background to not block the event loop
+    text = json.dumps(state_dict)
+    await background(directory.mkdir, parents=True, exist_ok=True)
+    await background((directory / name).write_text, text)
+
+
+async def load_state_dict(
+    directory: Path, name: str = "state.json"
+) -> Dict[str, Any]:
+    try:
+        text = await background((directory / name).read_text)
+    except OSError:
+        return {}
+    return json.loads(text)
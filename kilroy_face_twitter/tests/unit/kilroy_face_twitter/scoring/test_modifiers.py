@@ -0,0 +1,40 @@
+import pytest
+
+from kilroy_face_twitter.scoring.modifiers import ToxicityScoreModifier
+
+modifier = ToxicityScoreModifier.modifier
+
+
+@pytest.mark.parametrize("threshold", [0.2, 0.5, 0.8])
+@pytest.mark.parametrize("alpha", [0, 0.5, 0.9])
+def test_modifier_halves_the_score_at_the_threshold(threshold, alpha):
+    assert modifier(threshold, threshold, alpha) == pytest.approx(0.5)
+
+
+def test_modifier_decreases_with_toxicity():
+    values = [modifier(x / 10, 0.8, 0.9) for x in range(11)]
+
+    assert values[0] == 1
+    assert values[-1] == 0
+    assert values == sorted(values, reverse=True)
+
+
+@pytest.mark.parametrize(
+    "x, threshold, alpha, expected",
+    [
+        (-0.5, 0.8, 0.9, 1),
+        (1.5, 0.8, 0.9, 0),
+        (0.5, 0, 0.9, 0),
+        (0.5, -1, 0.9, 0),
+        (0.5, 1, 0.9, 1),
+        (0.5, 2, 0.9, 1),
+        (0.8, 0.8, 1, 1),
+        (0.8, 0.8, 2, 1),
+    ],
+)
+def test_modifier_handles_edge_cases(x, threshold, alpha, expected):
+    assert modifier(x, threshold, alpha) == expected
+
+
+def test_modifier_returns_plain_floats():
+    assert type(modifier(0.3, 0.8, 0.9)) is float
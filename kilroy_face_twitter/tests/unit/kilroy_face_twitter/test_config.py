@@ -0,0 +1,23 @@
+from io import StringIO
+
+from kilroy_face_twitter.config import get_config
+
+
+def test_get_config_without_overlays_returns_defaults():
+    config = get_config()
+
+    assert config.face_type == "textOnly"
+    assert config.server.port == 10001
+    assert config.face.consumer_key == "XXXXXXXXXXXXXXXXXXXXXXXXX"
+
+
+def test_get_config_merges_file_and_overrides():
+    f = StringIO("face_type: imageOnly\nserver:\n  port: 1234\n")
+
+    config = get_config(f, ["server.port=4321", "face.scrap_concurrency=2"])
+
+    assert config.face_type == "imageOnly"
+    assert config.server.port == 4321
+    assert config.server.host == "0.0.0.0"
+    assert config.face.scrap_concurrency == 2
+    assert config.face.consumer_key == "XXXXXXXXXXXXXXXXXXXXXXXXX"
@@ -0,0 +1,43 @@
+from kilroy_face_twitter.data import TweetFields
+
+
+def test_fields_addition_keeps_order_and_drops_duplicates():
+    a = TweetFields(tweet_fields=["text", "id"], expansions=["author_id"])
+    b = TweetFields(tweet_fields=["public_metrics", "text"])
+
+    fields = a + b
+
+    assert fields.tweet_fields == ["text", "id", "public_metrics"]
+    assert fields.expansions == ["author_id"]
+    assert fields.user_fields is None
+
+
+def test_fields_addition_with_empty_fields_returns_the_other():
+    fields = TweetFields(tweet_fields=["text"])
+
+    assert fields + TweetFields() is fields
+    assert TweetFields() + fields is fields
+
+
+def test_equal_fields_have_equal_hashes():
+    a = TweetFields(tweet_fields=["text"], user_fields=["id"])
+    b = TweetFields(tweet_fields=["text"], user_fields=["id"])
+
+    assert a == b
+    assert hash(a) == hash(b)
+    assert len({a, b}) == 1
+
+
+def test_fields_order_matters_for_equality():
+    a = TweetFields(tweet_fields=["text", "id"])
+    b = TweetFields(tweet_fields=["id", "text"])
+
+    assert a != b
+
+
+def test_fields_kwargs_are_not_shared():
+    fields = TweetFields(tweet_fields=["text"])
+
+    fields.to_kwargs()["tweet_fields"].append("id")
+
+    assert fields.to_kwargs() == {"tweet_fields": ["text"]}
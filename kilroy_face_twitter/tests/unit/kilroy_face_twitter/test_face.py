@@ -0,0 +1,163 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from kilroy_face_twitter import face
+from kilroy_face_twitter.face import TwitterFace
+from kilroy_face_twitter.utils import take
+
+
+class FakeProcessor:
+    async def to_external(self, data):
+        # later tweets finish first, so ordering is actually tested
+        await asyncio.sleep(0.01 / data)
+        return {"id": data}
+
+
+class FakeScorer:
+    def __init__(self, fail_on=None) -> None:
+        self.fail_on = fail_on
+
+    async def score(self, client, tweet, includes):
+        if tweet.id == self.fail_on:
+            raise RuntimeError("scoring failed")
+        return tweet.id / 10
+
+
+async def from_tweet(tweet, includes):
+    if tweet.id == 3:
+        raise ValueError("unsupported tweet")
+    return SimpleNamespace(data=tweet.id)
+
+
+async def tweets(n, fail_on=None):
+    for id in range(1, n + 1):
+        if id == fail_on:
+            raise RuntimeError("scraping failed")
+        yield SimpleNamespace(id=id), None
+
+
+def fetch(source, scorer=None):
+    return TwitterFace._fetch(
+        None, source, FakeProcessor(), scorer or FakeScorer(), None, 4
+    )
+
+
+def other_tasks():
+    return asyncio.all_tasks() - {asyncio.current_task()}
+
+
+@pytest.fixture(autouse=True)
+def fake_post(monkeypatch):
+    monkeypatch.setattr(face.Post, "from_tweet", from_tweet)
+
+
+def test_fetch_keeps_order_and_skips_unprocessable_tweets():
+    async def main():
+        return [id async for id, _, _ in fetch(tweets(10))]
+
+    assert asyncio.run(main()) == [1, 2, 4, 5, 6, 7, 8, 9, 10]
+
+
+def test_fetch_cleans_up_after_early_exit():
+    async def main():
+        results = fetch(tweets(100))
+        ids = [id async for id, _, _ in take(results, 2)]
+        await results.aclose()
+        await asyncio.sleep(0.05)
+        return ids, other_tasks()
+
+    ids, pending = asyncio.run(main())
+
+    assert ids == [1, 2]
+    assert not pending
+
+
+def test_fetch_passes_scraping_errors_after_earlier_results():
+    async def main():
+        ids = []
+        with pytest.raises(RuntimeError, match="scraping"):
+            async for id, _, _ in fetch(tweets(10, fail_on=6)):
+                ids.append(id)
+        await asyncio.sleep(0.05)
+        return ids, other_tasks()
+
+    ids, pending = asyncio.run(main())
+
+    assert ids == [1, 2, 4, 5]
+    assert not pending
+
+
+def test_fetch_cleans_up_after_scoring_errors():
+    async def main():
+        ids = []
+        with pytest.raises(RuntimeError, match="scoring"):
+            async for id, _, _ in fetch(tweets(10), FakeScorer(fail_on=5)):
+                ids.append(id)
+        await asyncio.sleep(0.05)
+        return ids, other_tasks()
+
+    ids, pending = asyncio.run(main())
+
+    assert ids == [1, 2, 4]
+    assert not pending
+
+
+def test_fetch_limits_concurrent_processing():
+    running = 0
+    peak = 0
+
+    class CountingScorer(FakeScorer):
+        async def score(self, client, tweet, includes):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return await super().score(client, tweet, includes)
+
+    async def main():
+        async for _ in fetch(tweets(20), CountingScorer()):
+            await asyncio.sleep(0.02)
+
+    asyncio.run(main())
+
+    assert peak == 4
+
+
+def test_process_cancels_processing_when_scoring_fails(monkeypatch):
+    started = asyncio.Event()
+    cancelled = False
+
+    async def slow_from_tweet(tweet, includes):
+        nonlocal cancelled
+        started.set()
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+
+    class FailingScorer:
+        async def score(self, client, tweet, includes):
+            await started.wait()
+            raise RuntimeError("scoring failed")
+
+    monkeypatch.setattr(face.Post, "from_tweet", slow_from_tweet)
+
+    async def main():
+        with pytest.raises(RuntimeError, match="scoring"):
+            await TwitterFace._process(
+                None,
+                SimpleNamespace(id=1),
+                None,
+                FakeProcessor(),
+                FailingScorer(),
+                None,
+            )
+        await asyncio.sleep(0)
+        return other_tasks()
+
+    assert not asyncio.run(main())
+    assert cancelled
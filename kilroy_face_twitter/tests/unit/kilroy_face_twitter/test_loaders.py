@@ -0,0 +1,79 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, List
+
+from kilroy_face_twitter.data import TweetFields
+from kilroy_face_twitter.loaders import TweetLoader
+
+
+class FakeV2:
+    def __init__(self, missing=()) -> None:
+        self.missing = set(missing)
+        self.calls: List[Any] = []
+
+    async def get_tweets(self, ids, user_auth, **kwargs):
+        self.calls.append((ids, kwargs))
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(id=id) for id in ids if id not in self.missing
+            ],
+            includes={"users": ["user"]},
+        )
+
+
+def make_loader(v2: FakeV2, **kwargs: Any) -> TweetLoader:
+    return TweetLoader(SimpleNamespace(v2=v2), **kwargs)
+
+
+def test_loader_batches_by_fields():
+    v2 = FakeV2()
+    text = TweetFields(tweet_fields=["text"])
+    metrics = TweetFields(tweet_fields=["public_metrics"])
+
+    async def main():
+        loader = make_loader(v2)
+        await asyncio.gather(
+            loader.load(1, text), loader.load(2, metrics), loader.load(3, text)
+        )
+
+    asyncio.run(main())
+
+    assert sorted(ids for ids, _ in v2.calls) == [[1, 3], [2]]
+
+
+def test_loader_fails_only_missing_tweets():
+    v2 = FakeV2(missing={2})
+    fields = TweetFields()
+
+    async def main():
+        loader = make_loader(v2)
+        return await asyncio.gather(
+            loader.load(1, fields),
+            loader.load(2, fields),
+            return_exceptions=True,
+        )
+
+    found, missing = asyncio.run(main())
+
+    assert found[0].id == 1
+    assert isinstance(missing, ValueError)
+    assert len(v2.calls) == 1
+
+
+def test_loader_passes_fields_to_the_request():
+    v2 = FakeV2()
+    fields = TweetFields(
+        expansions=["author_id"], user_fields=["public_metrics"]
+    )
+
+    async def main():
+        return await make_loader(v2).load(1, fields)
+
+    tweet, includes = asyncio.run(main())
+
+    assert tweet.id == 1
+    assert includes.users == ["user"]
+    assert v2.calls == [
+        ([1], {"expansions": ["author_id"], "user_fields": ["public_metrics"]})
+    ]
@@ -0,0 +1,34 @@
+import asyncio
+from typing import List
+
+from kilroy_face_twitter.models import ToxicityPredictor
+
+
+class FakeModel:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def predict(self, texts: List[str]):
+        self.calls.append(texts)
+        return {"toxicity": [len(text) / 10 for text in texts]}
+
+
+def test_predictor_batches_and_caches_predictions():
+    model = FakeModel()
+
+    async def main():
+        predictor = ToxicityPredictor(model, max_batch_size=2)
+        first = await asyncio.gather(
+            predictor.predict("a"),
+            predictor.predict("bb"),
+            predictor.predict("ccc"),
+            predictor.predict("a"),
+        )
+        second = await predictor.predict("bb")
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert first == [0.1, 0.2, 0.3, 0.1]
+    assert second == 0.2
+    assert model.calls == [["a", "bb"], ["ccc"]]
@@ -0,0 +1,67 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from kilroy_face_twitter.data import TweetFields
+from kilroy_face_twitter.scrapers import TimelineScraper
+from kilroy_face_twitter.utils import take
+
+
+class FakeClient:
+    def __init__(self, pages: int) -> None:
+        self.pages = pages
+        self.calls: List[Dict[str, Any]] = []
+        self.v2 = self
+
+    async def me(self):
+        return SimpleNamespace(id=0)
+
+    async def get_home_timeline(self, **params):
+        self.calls.append(dict(params))
+        page = int(params.get("pagination_token", 0))
+        size = params["max_results"]
+        meta = {"next_token": str(page + 1)} if page + 1 < self.pages else {}
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(
+                    id=page * size + i,
+                    author_id=1,
+                    referenced_tweets=None,
+                    text="text",
+                )
+                for i in range(size)
+            ],
+            includes={},
+            meta=meta,
+        )
+
+
+def scrap(client, limit=None):
+    async def main():
+        tweets = TimelineScraper().scrap(client, TweetFields(), limit=limit)
+        return [tweet.id async for tweet, _ in take(tweets, limit)]
+
+    return asyncio.run(main())
+
+
+def test_scraper_sizes_pages_by_limit():
+    client = FakeClient(pages=10)
+
+    assert scrap(client, limit=3) == [0, 1, 2]
+    assert [call["max_results"] for call in client.calls] == [3]
+
+
+def test_scraper_prefetches_pages_without_limit():
+    client = FakeClient(pages=3)
+
+    ids = scrap(client)
+
+    assert ids == list(range(300))
+    assert [call["max_results"] for call in client.calls] == [100] * 3
+
+
+def test_scraper_requests_more_pages_when_needed():
+    client = FakeClient(pages=10)
+
+    assert len(scrap(client, limit=150)) == 150
+    assert [call["max_results"] for call in client.calls] == [100, 100]
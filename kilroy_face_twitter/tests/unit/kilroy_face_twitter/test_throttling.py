@@ -0,0 +1,37 @@
+import asyncio
+import time
+
+import pytest
+
+from kilroy_face_twitter.throttling import RateLimiter
+
+
+@pytest.mark.parametrize("rate", [0, -1])
+def test_rate_limiter_rejects_non_positive_rates(rate):
+    with pytest.raises(ValueError):
+        RateLimiter(rate)
+
+
+def test_rate_limiter_spaces_out_calls():
+    async def main():
+        limiter = RateLimiter(50)
+        times = []
+        for _ in range(5):
+            await limiter.wait()
+            times.append(time.monotonic())
+        return times
+
+    times = asyncio.run(main())
+
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert all(gap >= 0.019 for gap in gaps)
+
+
+def test_rate_limiter_spaces_out_concurrent_calls():
+    async def main():
+        limiter = RateLimiter(50)
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.wait() for _ in range(5)))
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) >= 0.079
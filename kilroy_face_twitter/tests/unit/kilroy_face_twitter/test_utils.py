@@ -0,0 +1,135 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from kilroy_face_twitter.utils import BatchLoader, take
+
+
+class FakeFetch:
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.calls: List[List[int]] = []
+
+    async def __call__(self, keys: List[int]) -> List[int]:
+        self.calls.append(keys)
+        await asyncio.sleep(self.delay)
+        return [key * 10 for key in keys]
+
+
+def test_batch_loader_splits_batches_at_max_batch_size():
+    async def main():
+        fetch = FakeFetch()
+        loader = BatchLoader(fetch, max_batch_size=3)
+        values = await asyncio.gather(*(loader.load(key) for key in range(7)))
+        return values, fetch.calls
+
+    values, calls = asyncio.run(main())
+
+    assert values == [key * 10 for key in range(7)]
+    assert calls == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_batch_loader_batches_groups_separately():
+    async def main():
+        fetch = FakeFetch()
+        loader = BatchLoader(fetch, group=lambda key: key % 2)
+        await asyncio.gather(*(loader.load(key) for key in range(4)))
+        return fetch.calls
+
+    assert sorted(asyncio.run(main())) == [[0, 2], [1, 3]]
+
+
+def test_batch_loader_shares_pending_and_cached_results():
+    async def main():
+        fetch = FakeFetch()
+        loader = BatchLoader(fetch)
+        first = await asyncio.gather(loader.load(1), loader.load(1))
+        second = await loader.load(1)
+        return first, second, fetch.calls
+
+    first, second, calls = asyncio.run(main())
+
+    assert first == [10, 10]
+    assert second == 10
+    assert calls == [[1]]
+
+
+def test_batch_loader_evicts_expired_results():
+    async def main():
+        fetch = FakeFetch()
+        loader = BatchLoader(fetch, cache_ttl=0)
+        await loader.load(1)
+        await loader.load(1)
+        return fetch.calls
+
+    assert asyncio.run(main()) == [[1], [1]]
+
+
+def test_batch_loader_fails_only_keys_with_errors():
+    async def fetch(keys: List[int]) -> List[object]:
+        return [ValueError(key) if key == 2 else key for key in keys]
+
+    async def main():
+        loader = BatchLoader(fetch)
+        return await asyncio.gather(
+            *(loader.load(key) for key in range(1, 4)),
+            return_exceptions=True,
+        )
+
+    one, two, three = asyncio.run(main())
+
+    assert (one, three) == (1, 3)
+    assert isinstance(two, ValueError)
+
+
+def test_batch_loader_shares_failures_and_does_not_cache_them():
+    calls = []
+
+    async def fetch(keys: List[int]) -> List[int]:
+        calls.append(keys)
+        raise RuntimeError("failed")
+
+    async def main():
+        loader = BatchLoader(fetch)
+        results = await asyncio.gather(
+            loader.load(1), loader.load(2), return_exceptions=True
+        )
+        with pytest.raises(RuntimeError):
+            await loader.load(1)
+        return results
+
+    results = asyncio.run(main())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert calls == [[1, 2], [1]]
+
+
+def test_batch_loader_cancelling_one_waiter_keeps_the_others():
+    async def main():
+        fetch = FakeFetch(delay=0.05)
+        loader = BatchLoader(fetch)
+        cancelled = asyncio.create_task(loader.load(1))
+        waiting = asyncio.create_task(loader.load(1))
+        await asyncio.sleep(0.02)
+        cancelled.cancel()
+        return await waiting, cancelled.cancelled(), fetch.calls
+
+    value, cancelled, calls = asyncio.run(main())
+
+    assert value == 10
+    assert cancelled
+    assert calls == [[1]]
+
+
+def test_take():
+    async def numbers():
+        for number in range(5):
+            yield number
+
+    async def main(n):
+        return [number async for number in take(numbers(), n)]
+
+    assert asyncio.run(main(3)) == [0, 1, 2]
+    assert asyncio.run(main(None)) == [0, 1, 2, 3, 4]
+    assert asyncio.run(main(0)) == []